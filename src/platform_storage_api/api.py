@@ -1,6 +1,7 @@
 import asyncio
 import json
 import logging
+import posixpath
 import re
 import struct
 import time
@@ -26,13 +27,12 @@ from neuro_auth_client.security import AuthScheme, setup_security
 from neuro_logging import init_logging, setup_sentry
 
 from .cache import PermissionsCache
-from .config import Config, StorageMode
+from .config import Config
 from .fs.local import (
     DiskUsage,
     FileStatus,
     FileStatusPermission,
     FileStatusType,
-    FileSystem,
     LocalFileSystem,
 )
 from .security import (
@@ -41,12 +41,7 @@ from .security import (
     AuthAction,
     PermissionChecker,
 )
-from .storage import (
-    MultipleStoragePathResolver,
-    SingleStoragePathResolver,
-    Storage,
-    StoragePathResolver,
-)
+from .storage import Storage, create_path_resolver
 
 
 uvloop.install()
@@ -269,7 +264,6 @@ class StorageHandler:
         operation = self._parse_post_operation(request)
         if operation == StorageOperation.RENAME:
             storage_path: PurePath = self._get_fs_path_from_request(request)
-            await self._check_user_permissions(request, storage_path)
             return await self._handle_rename(storage_path, request)
         msg = f"Illegal operation: {operation}"
         raise ValueError(msg)
@@ -415,7 +409,9 @@ class StorageHandler:
                 try:
                     rel_path = payload.get("path", "")
                     self._validate_path(rel_path)
-                    path = storage_path / rel_path if rel_path else storage_path
+                    # Storage resolves and caches paths by their string form,
+                    # so there is no need to build a PurePath here
+                    path = posixpath.join(str(storage_path), rel_path)
                     await self._handle_websocket_message(
                         ws,
                         storage_path,
@@ -722,14 +718,18 @@ class StorageHandler:
         self, old: PurePath, request: web.Request
     ) -> web.StreamResponse:
         if "destination" not in request.query:
+            await self._check_user_permissions(request, old)
             msg = "No destination"
             raise _http_bad_request(msg)
         try:
-            new = PurePath(request.query["destination"])
-            if new.root == "":
-                new = old.parent / new
-            new = self._storage.sanitize_path(new)
-            await self._check_user_permissions(request, new)
+            destination = request.query["destination"]
+            if not destination.startswith("/"):
+                destination = posixpath.join(str(old.parent), destination)
+            new = self._storage.sanitize_path(destination)
+            # Both paths are checked with a single auth service request
+            await self._permission_checker.check_user_permissions_bulk(
+                request, [old, new], AuthAction.WRITE.value
+            )
             await self._storage.rename(old, new)
         except FileNotFoundError as e:
             raise web.HTTPNotFound from e
@@ -859,16 +859,6 @@ async def add_version_to_header(request: Request, response: web.StreamResponse)
     response.headers["X-Service-Version"] = f"platform-storage-api/{package_version}"
 
 
-def create_path_resolver(config: Config, fs: FileSystem) -> StoragePathResolver:
-    if config.storage.mode == StorageMode.SINGLE:
-        return SingleStoragePathResolver(config.storage.fs_local_base_path)
-    return MultipleStoragePathResolver(
-        fs,
-        config.storage.fs_local_base_path,
-        config.storage.fs_local_base_path / config.platform.cluster_name,
-    )
-
-
 async def create_app(config: Config) -> web.Application:
     app = web.Application(
         middlewares=[handle_exceptions],
@@ -901,7 +891,11 @@ async def create_app(config: Config) -> web.Application:
                 )
             )
             path_resolver = create_path_resolver(config, fs)
-            storage = Storage(path_resolver, fs)
+            storage = Storage(
+                path_resolver,
+                fs,
+                copy_chunk_size=config.storage.copy_chunk_size,
+            )
             app[API_V1_KEY][STORAGE_KEY] = storage
 
             # TODO (Rafa Zubairov): configured service shall ensure that
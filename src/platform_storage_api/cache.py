@@ -1,16 +1,15 @@
 import asyncio
 import collections
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass, field
 from pathlib import PurePath
 from typing import Optional
 
 from aiohttp import web
-from aiohttp_security.api import IDENTITY_KEY
 from neuro_auth_client.client import ClientAccessSubTreeView
 
-from .security import AbstractPermissionChecker
+from .security import AbstractPermissionChecker, get_identity
 
 
 TimeFactory = Callable[[], float]
@@ -52,7 +51,7 @@ class PermissionsCache(AbstractPermissionChecker):
         now = self._time_factory()
         tree = await self._checker.get_user_permissions_tree(request, target_path)
 
-        identity = await self._get_identity(request)
+        identity = await get_identity(request)
         assert identity
         key = identity, str(target_path)
         expired_at = now + self.expiration_interval_s
@@ -68,7 +67,7 @@ class PermissionsCache(AbstractPermissionChecker):
     ) -> Optional[ClientAccessSubTreeView]:
         self._cleanup_cache()
         stack = []
-        identity = await self._get_identity(request)
+        identity = await get_identity(request)
         if not identity:
             return None
 
@@ -114,10 +113,6 @@ class PermissionsCache(AbstractPermissionChecker):
             tree = sub_tree
         return tree
 
-    async def _get_identity(self, request: web.Request) -> Optional[str]:
-        identity_policy = request.config_dict[IDENTITY_KEY]
-        return await identity_policy.identify(request)
-
     def _update_cache(
         self, key: PermissionsCacheKey, cached: PermissionsCacheValue
     ) -> None:
@@ -133,6 +128,19 @@ class PermissionsCache(AbstractPermissionChecker):
 
         await self._checker.check_user_permissions(request, target_path, action)
 
+    async def check_user_permissions_bulk(
+        self, request: web.Request, target_paths: Sequence[PurePath], action: str
+    ) -> None:
+        unchecked_paths = []
+        for target_path in target_paths:
+            tree = await self._get_user_permissions_tree_cached(request, target_path)
+            if not tree or not tree.check_action_allowed(action):
+                unchecked_paths.append(target_path)
+        if unchecked_paths:
+            await self._checker.check_user_permissions_bulk(
+                request, unchecked_paths, action
+            )
+
     def _cleanup_cache(self) -> None:
         # Remove expired cached entities
         now = self._time_factory()
@@ -6,6 +6,8 @@ from typing import Optional
 
 from yarl import URL
 
+from .fs.local import DEFAULT_CHUNK_SIZE, DEFAULT_DISK_USAGE_CONCURRENCY
+
 
 @dataclass(frozen=True)
 class ServerConfig:
@@ -42,6 +44,8 @@ class StorageMode(str, enum.Enum):
 class StorageConfig:
     fs_local_base_path: PurePath
     fs_local_thread_pool_size: int = 100
+    fs_local_disk_usage_concurrency: int = DEFAULT_DISK_USAGE_CONCURRENCY
+    copy_chunk_size: int = DEFAULT_CHUNK_SIZE
 
     mode: StorageMode = StorageMode.SINGLE
 
@@ -96,12 +100,31 @@ class EnvironConfigFactory:
                 StorageConfig.fs_local_thread_pool_size,
             )
         )
+        fs_local_disk_usage_concurrency = int(
+            self._environ.get(
+                "NP_STORAGE_LOCAL_DISK_USAGE_CONCURRENCY",
+                StorageConfig.fs_local_disk_usage_concurrency,
+            )
+        )
+        if fs_local_disk_usage_concurrency < 1:
+            msg = "NP_STORAGE_LOCAL_DISK_USAGE_CONCURRENCY must be positive"
+            raise ValueError(msg)
+        copy_chunk_size = int(
+            self._environ.get(
+                "NP_STORAGE_COPY_CHUNK_SIZE", StorageConfig.copy_chunk_size
+            )
+        )
+        if copy_chunk_size < 1:
+            msg = "NP_STORAGE_COPY_CHUNK_SIZE must be positive"
+            raise ValueError(msg)
         return StorageConfig(
             mode=StorageMode(
                 self._environ.get("NP_STORAGE_MODE", StorageConfig.mode).lower()
             ),
             fs_local_base_path=PurePath(fs_local_base_path),
             fs_local_thread_pool_size=fs_local_thread_pool_size,
+            fs_local_disk_usage_concurrency=fs_local_disk_usage_concurrency,
+            copy_chunk_size=copy_chunk_size,
         )
 
     def create_server(self) -> ServerConfig:
@@ -20,6 +20,7 @@ import aiofiles
 
 
 SCANDIR_CHUNK_SIZE = 100
+DEFAULT_DISK_USAGE_CONCURRENCY = 32
 
 logger = logging.getLogger()
 
@@ -199,6 +200,7 @@ class FileSystem(AbstractAsyncContextManager):  # type: ignore
 
     @abc.abstractmethod
     async def disk_usage_by_file(self, *paths: PurePath) -> list[FileUsage]:
+        # Usages are returned in the same order as the given paths
         pass
 
 
@@ -207,10 +209,15 @@ class LocalFileSystem(FileSystem):
         self,
         *,
         executor_max_workers: Optional[int] = None,
+        disk_usage_concurrency: int = DEFAULT_DISK_USAGE_CONCURRENCY,
         loop: Optional[asyncio.AbstractEventLoop] = None,
         **kwargs: Any,
     ) -> None:
+        if disk_usage_concurrency < 1:
+            msg = "disk_usage_concurrency must be positive"
+            raise ValueError(msg)
         self._executor_max_workers = executor_max_workers
+        self._disk_usage_concurrency = disk_usage_concurrency
         self._executor: Optional[ThreadPoolExecutor] = None
 
         self._loop = loop or asyncio.get_event_loop()
@@ -418,6 +425,14 @@ class LocalFileSystem(FileSystem):
                 dir_iter.close,  # type: ignore
             )
 
+    def _liststatus(self, path: PurePath) -> list[FileStatus]:
+        return list(self._scandir_iter(path))
+
+    async def liststatus(self, path: PurePath) -> list[FileStatus]:
+        # The whole listing is built in a single executor call instead of
+        # going through the chunked iterator
+        return await self._loop.run_in_executor(self._executor, self._liststatus, path)
+
     def _get_file_or_dir_status(self, path: PurePath) -> FileStatus:
         with self._resolve_dir_fd(path.parent) as dirfd:
             name = path.name
@@ -606,32 +621,30 @@ class LocalFileSystem(FileSystem):
         return await self._loop.run_in_executor(self._executor, self._disk_usage, path)
 
     async def disk_usage_by_file(self, *paths: PurePath) -> list[FileUsage]:
-        async with aiofiles.tempfile.NamedTemporaryFile("w") as temp_file:
-            await temp_file.write("\0".join(str(p) for p in paths))
-            await temp_file.flush()
-            process = await asyncio.subprocess.create_subprocess_exec(
-                "du",
-                "-sh",
-                f"--files0-from={temp_file.name}",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await process.communicate()
+        # Every path is scanned by a separate du process, so the usages do not
+        # depend on which of the other paths are nested in or hard-linked with
+        semaphore = asyncio.Semaphore(self._disk_usage_concurrency)
+
+        async def _get_usage(path: PurePath) -> FileUsage:
+            async with semaphore:
+                return await self._disk_usage_by_file(path)
+
+        return list(await asyncio.gather(*(_get_usage(p) for p in paths)))
+
+    async def _disk_usage_by_file(self, path: PurePath) -> FileUsage:
+        process = await asyncio.subprocess.create_subprocess_exec(
+            "du",
+            "-sh",
+            "--",
+            str(path),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await process.communicate()
         if process.returncode:
             raise FileSystemException(stderr.decode())
-        result = []
-        for line in stdout.splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            size_str, *_, path = line.split()
-            result.append(
-                FileUsage(
-                    path=PurePath(path.decode()),
-                    size=parse_du_size_output(size_str.decode()),
-                )
-            )
-        return result
+        size_str, _ = stdout.split(b"\t", 1)
+        return FileUsage(path=path, size=parse_du_size_output(size_str.decode()))
 
 
 _SIZE_UNIT_POWERS = {
@@ -662,23 +675,35 @@ async def copy_streams(
     size: Optional[int] = None,
     chunk_size: int = DEFAULT_CHUNK_SIZE,
 ) -> None:
-    """perform chunked copying of data between two streams.
+    """perform chunked copying of data between two streams, reading the next
+    chunk while the previous one is still being written.
 
-    It is assumed that stream implementations would handle retries themselves.
+    Writes are issued strictly one after another. It is assumed that stream
+    implementations would handle retries themselves.
     """
-    if size is None:
-        while True:
-            chunk = await outstream.read(chunk_size)
-            if not chunk:
-                break
-            await instream.write(chunk)
-    else:
-        while size > 0:
-            chunk = await outstream.read(min(size, chunk_size))
+    write_task: Optional[asyncio.Future[Any]] = None
+    try:
+        while size is None or size > 0:
+            chunk = await outstream.read(
+                chunk_size if size is None else min(size, chunk_size)
+            )
+            if write_task is not None:
+                # The write is shielded, so that it is still pending and
+                # waited for below if the copying is cancelled meanwhile
+                await asyncio.shield(write_task)
+                write_task = None
             if not chunk:
                 break
-            size -= len(chunk)
-            await instream.write(chunk)
+            if size is not None:
+                size -= len(chunk)
+            write_task = asyncio.ensure_future(instream.write(chunk))
+        if write_task is not None:
+            await asyncio.shield(write_task)
+            write_task = None
+    finally:
+        if write_task is not None:
+            # Do not let the caller close the stream under a pending write
+            await asyncio.wait([write_task])
 
 
 _T = TypeVar("_T")
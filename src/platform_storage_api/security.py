@@ -1,12 +1,17 @@
 import abc
+import asyncio
 import logging
+from collections.abc import Awaitable, Callable, Sequence
 from enum import Enum
+from functools import lru_cache, partial
 from pathlib import PurePath
+from typing import Any, NoReturn, Optional, TypeVar
 
 from aiohttp import web
-from aiohttp_security import check_authorized, check_permission
+from aiohttp_security import authorized_userid, check_permission
+from aiohttp_security.api import IDENTITY_KEY
 from neuro_auth_client import AuthClient, Permission
-from neuro_auth_client.client import ClientAccessSubTreeView
+from neuro_auth_client.client import ClientAccessSubTreeView, ClientSubTreeViewRoot
 from yarl import URL
 
 from .config import Config
@@ -16,6 +21,23 @@ logger = logging.getLogger(__name__)
 
 AUTH_CLIENT_KEY = web.AppKey("auth_client", AuthClient)
 
+_T = TypeVar("_T")
+
+
+@lru_cache(maxsize=4096)
+def _quote_path(path: str) -> str:
+    return URL.build(path=path).raw_path
+
+
+def _retrieve_exception(task: asyncio.Task[Any]) -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+async def get_identity(request: web.Request) -> Optional[str]:
+    identity_policy = request.config_dict[IDENTITY_KEY]
+    return await identity_policy.identify(request)
+
 
 class AuthAction(str, Enum):
     DENY = "deny"
@@ -43,61 +65,118 @@ class AbstractPermissionChecker:
     ) -> None:
         pass
 
+    async def check_user_permissions_bulk(
+        self, request: web.Request, target_paths: Sequence[PurePath], action: str
+    ) -> None:
+        for target_path in target_paths:
+            await self.check_user_permissions(request, target_path, action)
+
 
 class PermissionChecker(AbstractPermissionChecker):
     def __init__(self, app: web.Application, config: Config) -> None:
         self._app = app
         self._config = config
+        self._inflight: dict[tuple[Optional[str], ...], asyncio.Task[Any]] = {}
+        self._auth_client: Optional[AuthClient] = None
+        self._unauthorized_headers = {
+            "WWW-Authenticate": f'Bearer realm="{config.server.name}"'
+        }
+        assert config.platform.cluster_name
+        self._uri_prefix = str(
+            URL.build(scheme="storage", host=config.platform.cluster_name)
+        )
 
     def _path_to_uri(self, target_path: PurePath) -> str:
-        assert str(target_path)[0] == "/"
-        assert self._config.platform.cluster_name
-        return str(
-            URL.build(
-                scheme="storage",
-                host=self._config.platform.cluster_name,
-                path=str(target_path),
-            )
-        )
+        assert target_path.is_absolute()
+        # Only the path needs quoting, the scheme and host are rendered once
+        return self._uri_prefix + _quote_path(str(target_path))
 
     async def get_user_permissions_tree(
         self, request: web.Request, target_path: PurePath
     ) -> ClientAccessSubTreeView:
-        username = await self._get_username_from_request(request)
-        auth_client = self._get_auth_client()
         target_path_uri = self._path_to_uri(target_path)
-        tree = await auth_client.get_permissions_tree(username, target_path_uri)
+        identity = await get_identity(request)
+        tree = await self._singleflight(
+            ("tree", identity, target_path_uri),
+            partial(self._get_permissions_tree, request, target_path_uri),
+        )
+        if tree is None:
+            self._raise_unauthorized()
         if tree.sub_tree.action == AuthAction.DENY.value:
             raise web.HTTPNotFound
         return tree.sub_tree
 
+    async def _get_permissions_tree(
+        self, request: web.Request, target_path_uri: str
+    ) -> Optional[ClientSubTreeViewRoot]:
+        username = await authorized_userid(request)
+        if username is None:
+            return None
+        auth_client = self._get_auth_client()
+        return await auth_client.get_permissions_tree(username, target_path_uri)
+
     async def check_user_permissions(
         self, request: web.Request, target_path: PurePath, action: str
     ) -> None:
-        uri = self._path_to_uri(target_path)
-        permission = Permission(uri=uri, action=action)
-        logger.info("Checking %s", permission)
+        await self.check_user_permissions_bulk(request, [target_path], action)
+
+    async def check_user_permissions_bulk(
+        self, request: web.Request, target_paths: Sequence[PurePath], action: str
+    ) -> None:
+        permissions = [
+            Permission(uri=self._path_to_uri(target_path), action=action)
+            for target_path in target_paths
+        ]
+        logger.info("Checking %s", permissions)
         # TODO (Rafa Zubairov): test if user accessing his own data,
         # then use JWT token claims
-        try:
-            await check_permission(request, action, [permission])
-        except web.HTTPUnauthorized:
+        identity = await get_identity(request)
+        allowed = await self._singleflight(
+            ("check", identity, action, *(p.uri for p in permissions)),
+            partial(self._check_permissions, request, action, permissions),
+        )
+        if allowed is None:
             # TODO (Rafa Zubairov): Use tree based approach here
             self._raise_unauthorized()
-        except web.HTTPForbidden as e:
-            raise web.HTTPNotFound from e
-
-    def _raise_unauthorized(self) -> None:
-        raise web.HTTPUnauthorized(
-            headers={"WWW-Authenticate": f'Bearer realm="{self._config.server.name}"'}
-        )
+        if not allowed:
+            raise web.HTTPNotFound
 
-    async def _get_username_from_request(self, request: web.Request) -> str:
+    async def _check_permissions(
+        self, request: web.Request, action: str, permissions: list[Permission]
+    ) -> Optional[bool]:
+        # Outcomes are returned rather than raised: the result is shared
+        # between coalesced requests, and aiohttp uses raised HTTP errors
+        # as responses, so they must not be shared.
         try:
-            user_name = await check_authorized(request)
+            await check_permission(request, action, permissions)
         except web.HTTPUnauthorized:
-            self._raise_unauthorized()
-        return user_name
+            return None
+        except web.HTTPForbidden:
+            return False
+        return True
+
+    async def _singleflight(
+        self,
+        key: tuple[Optional[str], ...],
+        func: Callable[[], Awaitable[_T]],
+    ) -> _T:
+        """Run func once for all concurrent callers with the same key."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            # All the waiters may be cancelled, in which case nobody else
+            # would retrieve the exception
+            task.add_done_callback(_retrieve_exception)
+        return await asyncio.shield(task)
+
+    def _raise_unauthorized(self) -> NoReturn:
+        # The headers are copied by the response, so the dict can be shared
+        raise web.HTTPUnauthorized(headers=self._unauthorized_headers)
 
     def _get_auth_client(self) -> AuthClient:
-        return self._app[AUTH_CLIENT_KEY]
+        # The client is only put into the app on startup, so look it up lazily
+        if self._auth_client is None:
+            self._auth_client = self._app[AUTH_CLIENT_KEY]
+        return self._auth_client
@@ -1,14 +1,17 @@
 import abc
-import dataclasses
+import functools
 import os
-from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
 from pathlib import Path, PurePath
 from typing import Any, Optional, Union
 
 from neuro_logging import trace, trace_cm
 
+from .config import Config, StorageMode
 from .fs.local import (
+    DEFAULT_CHUNK_SIZE,
     DiskUsage,
     FileStatus,
     FileSystem,
@@ -17,22 +20,42 @@ from .fs.local import (
 )
 
 
+@functools.lru_cache(maxsize=8192)
+def _resolve_real_path(base_path: str, path: str) -> PurePath:
+    return PurePath(base_path, PurePath(path).relative_to("/"))
+
+
+@functools.lru_cache(maxsize=8192)
+def _sanitize_path(path: str) -> PurePath:
+    return PurePath(os.path.normpath("/" + path.lstrip("/")))
+
+
+@functools.lru_cache(maxsize=8192)
+def _get_storage_folder(path: str) -> str:
+    parts = PurePath(path).relative_to("/").parts
+    return parts[0] if parts else ""
+
+
 class StoragePathResolver(abc.ABC):
     @abc.abstractmethod
-    async def resolve_base_path(self, path: Optional[PurePath] = None) -> PurePath:
+    async def resolve_base_path(
+        self, path: Union[PurePath, str, None] = None
+    ) -> PurePath:
         pass
 
-    async def resolve_path(self, path: PurePath) -> PurePath:
+    async def resolve_path(self, path: Union[PurePath, str]) -> PurePath:
         # TODO: (A Danshyn 04/23/18): validate paths
         base_path = await self.resolve_base_path(path)
-        return PurePath(base_path, path.relative_to("/"))
+        return _resolve_real_path(str(base_path), str(path))
 
 
 class SingleStoragePathResolver(StoragePathResolver):
     def __init__(self, base_path: Union[PurePath, str]) -> None:
         self._base_path = PurePath(base_path)
 
-    async def resolve_base_path(self, path: Optional[PurePath] = None) -> PurePath:
+    async def resolve_base_path(
+        self, path: Union[PurePath, str, None] = None
+    ) -> PurePath:
         return self._base_path
 
 
@@ -42,24 +65,57 @@ class MultipleStoragePathResolver(StoragePathResolver):
         fs: FileSystem,
         base_path: Union[PurePath, str],
         default_path: Union[PurePath, str],
+        *,
+        time_factory: Callable[[], float] = time.monotonic,
+        expiration_interval_s: float = 30.0,
     ) -> None:
         self._fs = fs
         self._base_path = PurePath(base_path)
         self._default_path = PurePath(default_path)
+        self._time_factory = time_factory
+        self._expiration_interval_s = expiration_interval_s
+        # Only existing folders are cached, so that a newly created one
+        # is picked up immediately
+        self._existing_folders: dict[str, float] = {}
 
-    async def resolve_base_path(self, path: Optional[PurePath] = None) -> PurePath:
-        if path is None or path == PurePath("/"):
+    async def resolve_base_path(
+        self, path: Union[PurePath, str, None] = None
+    ) -> PurePath:
+        folder = _get_storage_folder(str(path)) if path is not None else ""
+        if not folder:
             return self._base_path
-        storage_folder = Path(self._base_path, path.relative_to("/").parts[0])
-        if await self._fs.exists(storage_folder):
+        now = self._time_factory()
+        expired_at = self._existing_folders.get(folder)
+        if expired_at is not None and now < expired_at:
             return self._base_path
+        if await self._fs.exists(Path(self._base_path, folder)):
+            self._existing_folders[folder] = now + self._expiration_interval_s
+            return self._base_path
+        self._existing_folders.pop(folder, None)
         return self._default_path
 
 
+def create_path_resolver(config: Config, fs: FileSystem) -> StoragePathResolver:
+    if config.storage.mode == StorageMode.SINGLE:
+        return SingleStoragePathResolver(config.storage.fs_local_base_path)
+    return MultipleStoragePathResolver(
+        fs,
+        config.storage.fs_local_base_path,
+        config.storage.fs_local_base_path / config.platform.cluster_name,
+    )
+
+
 class Storage:
-    def __init__(self, path_resolver: StoragePathResolver, fs: FileSystem) -> None:
+    def __init__(
+        self,
+        path_resolver: StoragePathResolver,
+        fs: FileSystem,
+        *,
+        copy_chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> None:
         self._fs = fs
         self._path_resolver = path_resolver
+        self._copy_chunk_size = copy_chunk_size
 
     def sanitize_path(self, path: Union[str, "os.PathLike[str]"]) -> PurePath:
         """
@@ -68,8 +124,7 @@ class Storage:
         :param path:
         :return: string which contains sanitized path
         """
-        normpath = os.path.normpath(str(PurePath("/", path)))
-        return PurePath(normpath)
+        return _sanitize_path(os.fspath(path))
 
     @trace
     async def store(
@@ -81,13 +136,23 @@ class Storage:
         *,
         create: bool = True,
     ) -> None:
-        real_path = await self._path_resolver.resolve_path(PurePath(path))
-        if create:
-            await self._fs.mkdir(real_path.parent)
-        async with self._fs.open(real_path, "wb" if create else "rb+") as f:
+        real_path = await self._path_resolver.resolve_path(path)
+        mode = "wb" if create else "rb+"
+        async with AsyncExitStack() as exit_stack:
+            try:
+                f = await exit_stack.enter_async_context(self._fs.open(real_path, mode))
+            except FileNotFoundError:
+                # The parent directory usually exists, so it is only created
+                # when opening the file has failed
+                if not create:
+                    raise
+                await self._fs.mkdir(real_path.parent)
+                f = await exit_stack.enter_async_context(self._fs.open(real_path, mode))
             if offset:
                 await f.seek(offset)
-            await copy_streams(outstream, f, size=size)
+            await copy_streams(
+                outstream, f, size=size, chunk_size=self._copy_chunk_size
+            )
 
     @trace
     async def retrieve(
@@ -97,15 +162,15 @@ class Storage:
         offset: int = 0,
         size: Optional[int] = None,
     ) -> None:
-        real_path = await self._path_resolver.resolve_path(PurePath(path))
+        real_path = await self._path_resolver.resolve_path(path)
         async with self._fs.open(real_path, "rb") as f:
             if offset:
                 await f.seek(offset)
-            await copy_streams(f, instream, size=size)
+            await copy_streams(f, instream, size=size, chunk_size=self._copy_chunk_size)
 
     @asynccontextmanager
     async def _open(self, path: Union[PurePath, str]) -> Any:
-        real_path = await self._path_resolver.resolve_path(PurePath(path))
+        real_path = await self._path_resolver.resolve_path(path)
         try:
             async with self._fs.open(real_path, "rb+") as f:
                 yield f
@@ -127,8 +192,7 @@ class Storage:
 
     @trace
     async def read(self, path: Union[PurePath, str], offset: int, size: int) -> bytes:
-        real_path = await self._path_resolver.resolve_path(PurePath(path))
-        await self._fs.mkdir(real_path.parent)
+        real_path = await self._path_resolver.resolve_path(path)
         async with self._fs.open(real_path, "rb") as f:
             await f.seek(offset)
             return await f.read(size)
@@ -138,47 +202,50 @@ class Storage:
         self, path: Union[PurePath, str]
     ) -> AsyncIterator[AsyncIterator[FileStatus]]:
         async with trace_cm("Storage.iterstatus"):
-            real_path = await self._path_resolver.resolve_path(PurePath(path))
+            real_path = await self._path_resolver.resolve_path(path)
             async with self._fs.iterstatus(real_path) as it:
                 yield it
 
     @trace
     async def liststatus(self, path: Union[PurePath, str]) -> list[FileStatus]:
-        real_path = await self._path_resolver.resolve_path(PurePath(path))
+        real_path = await self._path_resolver.resolve_path(path)
         return await self._fs.liststatus(real_path)
 
     @trace
     async def get_filestatus(self, path: Union[PurePath, str]) -> FileStatus:
-        real_path = await self._path_resolver.resolve_path(PurePath(path))
+        real_path = await self._path_resolver.resolve_path(path)
         return await self._fs.get_filestatus(real_path)
 
     @trace
     async def exists(self, path: Union[PurePath, str]) -> bool:
-        real_path = await self._path_resolver.resolve_path(PurePath(path))
+        real_path = await self._path_resolver.resolve_path(path)
         return await self._fs.exists(real_path)
 
     @trace
     async def mkdir(self, path: Union[PurePath, str]) -> None:
-        real_path = await self._path_resolver.resolve_path(PurePath(path))
+        real_path = await self._path_resolver.resolve_path(path)
         await self._fs.mkdir(real_path)
 
     @trace
     async def remove(
         self, path: Union[PurePath, str], *, recursive: bool = False
     ) -> None:
-        real_path = await self._path_resolver.resolve_path(PurePath(path))
+        real_path = await self._path_resolver.resolve_path(path)
         await self._fs.remove(real_path, recursive=recursive)
 
     @trace
     async def iterremove(
         self, path: Union[PurePath, str], *, recursive: bool = False
     ) -> AsyncIterator[RemoveListing]:
-        base_path = await self._path_resolver.resolve_base_path(PurePath(path))
-        real_path = await self._path_resolver.resolve_path(PurePath(path))
+        base_path = await self._path_resolver.resolve_base_path(path)
+        real_path = _resolve_real_path(str(base_path), str(path))
+        # The listed paths are normalized and lie under base_path,
+        # so stripping the prefix is enough to make them storage paths
+        base_prefix_len = len(str(base_path).rstrip("/"))
         return (
-            dataclasses.replace(
-                remove_listing,
-                path=self.sanitize_path(remove_listing.path.relative_to(base_path)),
+            RemoveListing(
+                path=PurePath(str(remove_listing.path)[base_prefix_len:] or "/"),
+                is_dir=remove_listing.is_dir,
             )
             async for remove_listing in self._fs.iterremove(
                 real_path, recursive=recursive
@@ -189,11 +256,11 @@ class Storage:
     async def rename(
         self, old: Union[PurePath, str], new: Union[PurePath, str]
     ) -> None:
-        real_old = await self._path_resolver.resolve_path(PurePath(old))
-        real_new = await self._path_resolver.resolve_path(PurePath(new))
+        real_old = await self._path_resolver.resolve_path(old)
+        real_new = await self._path_resolver.resolve_path(new)
         await self._fs.rename(real_old, real_new)
 
     @trace
     async def disk_usage(self, path: Union[PurePath, str, None] = None) -> DiskUsage:
-        real_path = await self._path_resolver.resolve_path(PurePath(path or "/"))
+        real_path = await self._path_resolver.resolve_path(path or "/")
         return await self._fs.disk_usage(real_path)
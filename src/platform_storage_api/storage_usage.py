@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from collections import defaultdict
 from collections.abc import Iterable, Sequence
@@ -11,6 +12,7 @@ from typing import TYPE_CHECKING, Optional
 from neuro_admin_client import AdminClient
 from prometheus_client.metrics_core import GaugeMetricFamily, Metric
 from prometheus_client.registry import Collector
+from prometheus_client.samples import Sample
 
 from .config import Config, S3Config
 from .fs.local import FileStatusType, FileSystem
@@ -64,45 +66,54 @@ class StorageUsageService:
         file_usages = await self._fs.disk_usage_by_file(
             *(p.path for p in org_project_paths)
         )
-        file_sizes = {u.path: u.size for u in file_usages}
         return StorageUsage(
             projects=[
                 StorageUsage.Project(
                     org_name=p.org_name,
                     project_name=p.project_name,
-                    used=file_sizes[p.path],
+                    used=u.size,
                 )
-                for p in org_project_paths
+                for p, u in zip(org_project_paths, file_usages)
             ],
         )
 
     async def _get_project_paths(self) -> list[ProjectPath]:
         projects_by_org = await self._get_projects_by_org()
+        org_project_paths = await asyncio.gather(
+            *(
+                self._get_org_project_paths(org_name, project_names)
+                for org_name, project_names in projects_by_org.items()
+            )
+        )
+        return [p for project_paths in org_project_paths for p in project_paths]
+
+    async def _get_org_project_paths(
+        self, org_name: str | None, project_names: set[str]
+    ) -> list[ProjectPath]:
+        org_path = await self._resolve_org_path(org_name)
         result = []
-        for org_name, project_names in projects_by_org.items():
-            org_path = await self._resolve_org_path(org_name)
-            try:
-                async with self._fs.iterstatus(org_path) as statuses:
-                    async for status in statuses:
-                        if status.type != FileStatusType.DIRECTORY:
-                            continue
-                        project_name = status.path.name
-                        if project_name not in project_names:
-                            continue
-                        LOGGER.debug(
-                            "Collecting storage usage for org %s, project %s",
-                            org_name or "NO_ORG",
-                            project_name,
-                        )
-                        result.append(
-                            ProjectPath(
-                                org_name=org_name,
-                                project_name=project_name,
-                                path=org_path / project_name,
-                            )
+        try:
+            async with self._fs.iterstatus(org_path) as statuses:
+                async for status in statuses:
+                    if status.type != FileStatusType.DIRECTORY:
+                        continue
+                    project_name = status.path.name
+                    if project_name not in project_names:
+                        continue
+                    LOGGER.debug(
+                        "Collecting storage usage for org %s, project %s",
+                        org_name or "NO_ORG",
+                        project_name,
+                    )
+                    result.append(
+                        ProjectPath(
+                            org_name=org_name,
+                            project_name=project_name,
+                            path=org_path / project_name,
                         )
-            except FileNotFoundError:
-                continue
+                    )
+        except FileNotFoundError:
+            return []
         return result
 
     async def _get_projects_by_org(self) -> dict[str | None, set[str]]:
@@ -142,8 +153,17 @@ class StorageUsageCollector(Collector):
             "The amount of used storage space in bytes",
             labels=["org_name", "project_name"],
         )
-        for project in storage_usage.projects:
-            metric_family.add_metric(
-                [project.org_name or "no_org", project.project_name], project.used
+        # Samples are built directly rather than through add_metric,
+        # which zips the label names with the values for every project
+        metric_family.samples = [
+            Sample(
+                metric_family.name,
+                {
+                    "org_name": project.org_name or "no_org",
+                    "project_name": project.project_name,
+                },
+                project.used,
             )
+            for project in storage_usage.projects
+        ]
         yield metric_family
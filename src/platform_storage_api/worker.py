@@ -4,24 +4,22 @@ import asyncio
 import logging
 import signal
 from collections.abc import AsyncIterator
-from contextlib import AsyncExitStack, asynccontextmanager
+from contextlib import AbstractAsyncContextManager, AsyncExitStack, asynccontextmanager
 from dataclasses import dataclass
-from typing import NoReturn
+from typing import Any, NoReturn
 
 import aiobotocore
+import aiobotocore.client
 import aiobotocore.session
+import uvloop
 from neuro_admin_client import AdminClient
 from neuro_logging import init_logging, new_trace, setup_sentry
 
-from .config import Config, EnvironConfigFactory, StorageMode
-from .fs.local import FileSystem, LocalFileSystem
+from .config import Config, EnvironConfigFactory
+from .fs.local import LocalFileSystem
 from .s3 import create_async_s3_client
 from .s3_storage import StorageMetricsAsyncS3Storage
-from .storage import (
-    MultipleStoragePathResolver,
-    SingleStoragePathResolver,
-    StoragePathResolver,
-)
+from .storage import create_path_resolver
 from .storage_usage import StorageUsageService
 
 
@@ -39,22 +37,41 @@ class App:
         LOGGER.info("Finished storage usage collection")
 
 
-def create_path_resolver(config: Config, fs: FileSystem) -> StoragePathResolver:
-    if config.storage.mode == StorageMode.SINGLE:
-        return SingleStoragePathResolver(config.storage.fs_local_base_path)
-    return MultipleStoragePathResolver(
-        fs,
-        config.storage.fs_local_base_path,
-        config.storage.fs_local_base_path / config.platform.cluster_name,
+async def _enter_async_contexts(
+    exit_stack: AsyncExitStack, *cms: AbstractAsyncContextManager[Any]
+) -> list[Any]:
+    # All contexts are awaited before failing, so that every context
+    # that was entered gets registered in the exit stack and closed
+    results = await asyncio.gather(
+        *(exit_stack.enter_async_context(cm) for cm in cms), return_exceptions=True
     )
+    values: list[Any] = []
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+        values.append(result)
+    return values
 
 
 @asynccontextmanager
 async def create_app(config: Config) -> AsyncIterator[App]:
     async with AsyncExitStack() as exit_stack:
         session = aiobotocore.session.get_session()
-        s3_client = await exit_stack.enter_async_context(
-            create_async_s3_client(session, config.s3)
+        # The clients are independent, so they are started concurrently
+        s3_client: aiobotocore.client.AioBaseClient
+        admin_client: AdminClient
+        fs: LocalFileSystem
+        s3_client, admin_client, fs = await _enter_async_contexts(
+            exit_stack,
+            create_async_s3_client(session, config.s3),
+            AdminClient(
+                base_url=config.platform.admin_url,
+                service_token=config.platform.token,
+            ),
+            LocalFileSystem(
+                executor_max_workers=config.storage.fs_local_thread_pool_size,
+                disk_usage_concurrency=config.storage.fs_local_disk_usage_concurrency,
+            ),
         )
 
         storage_metrics_s3_storage = StorageMetricsAsyncS3Storage(
@@ -63,19 +80,6 @@ async def create_app(config: Config) -> AsyncIterator[App]:
             key_prefix=config.s3.key_prefix,
         )
 
-        admin_client = await exit_stack.enter_async_context(
-            AdminClient(
-                base_url=config.platform.admin_url,
-                service_token=config.platform.token,
-            )
-        )
-
-        fs = await exit_stack.enter_async_context(
-            LocalFileSystem(
-                executor_max_workers=config.storage.fs_local_thread_pool_size
-            )
-        )
-
         path_resolver = create_path_resolver(config, fs)
 
         storage_usage_service = StorageUsageService(
@@ -100,13 +104,13 @@ def _raise_graceful_exit() -> NoReturn:
 
 
 def setup() -> None:
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
     loop.add_signal_handler(signal.SIGINT, _raise_graceful_exit)
     loop.add_signal_handler(signal.SIGTERM, _raise_graceful_exit)
 
 
 def cleanup() -> None:
-    loop = asyncio.get_event_loop()
+    loop = asyncio.get_running_loop()
     loop.remove_signal_handler(signal.SIGINT)
     loop.remove_signal_handler(signal.SIGTERM)
 
@@ -129,4 +133,5 @@ def main() -> None:
     config = EnvironConfigFactory().create()
     LOGGER.info("Loaded config: %s", config)
 
+    uvloop.install()
     asyncio.run(run(config))
@@ -209,6 +209,39 @@ async def test_cached_parent_permissions(
     assert call_log == []
 
 
+async def test_cached_permissions_bulk(
+    call_log: list[Any],
+    permission_tree: ClientAccessSubTreeView,
+    mock_time: Any,
+    cache: PermissionsCache,
+    webrequest: Request,
+) -> None:
+    # Warm up the cache
+    tree = await cache.get_user_permissions_tree(webrequest, P("/alice"))
+    assert tree == ClientAccessSubTreeView("manage", {})
+    assert call_log == [("tree", P("/alice"))]
+    call_log.clear()
+
+    # Only paths not covered by the cache are passed to the checker
+    await cache.check_user_permissions_bulk(
+        webrequest, [P("/alice/file"), P("/bob/folder/file")], "write"
+    )
+    assert call_log == [("check", P("/bob/folder/file"))]
+    call_log.clear()
+
+    with pytest.raises(HTTPNotFound):
+        await cache.check_user_permissions_bulk(
+            webrequest, [P("/alice/file"), P("/bob/folder")], "write"
+        )
+    assert call_log == [("check", P("/bob/folder"))]
+    call_log.clear()
+
+    await cache.check_user_permissions_bulk(
+        webrequest, [P("/alice/file"), P("/alice/folder")], "write"
+    )
+    assert call_log == []
+
+
 async def test_expired_permissions_check(
     call_log: list[Any],
     permission_tree: ClientAccessSubTreeView,
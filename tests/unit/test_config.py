@@ -34,6 +34,22 @@ class TestStorageConfig:
         with pytest.raises(KeyError, match="NP_STORAGE_LOCAL_BASE_PATH"):
             StorageConfig.from_environ(environ)
 
+    def test_from_environ_invalid_disk_usage_concurrency(self) -> None:
+        environ = {
+            "NP_STORAGE_LOCAL_BASE_PATH": "/path/to/dir",
+            "NP_STORAGE_LOCAL_DISK_USAGE_CONCURRENCY": "0",
+        }
+        with pytest.raises(ValueError, match="NP_STORAGE_LOCAL_DISK_USAGE_CONCURRENCY"):
+            StorageConfig.from_environ(environ)
+
+    def test_from_environ_invalid_copy_chunk_size(self) -> None:
+        environ = {
+            "NP_STORAGE_LOCAL_BASE_PATH": "/path/to/dir",
+            "NP_STORAGE_COPY_CHUNK_SIZE": "0",
+        }
+        with pytest.raises(ValueError, match="NP_STORAGE_COPY_CHUNK_SIZE"):
+            StorageConfig.from_environ(environ)
+
 
 class TestConfig:
     def test_from_environ_defaults(self) -> None:
@@ -52,6 +68,8 @@ class TestConfig:
         assert config.storage.mode == StorageMode.SINGLE
         assert config.storage.fs_local_base_path == PurePath("/path/to/dir")
         assert config.storage.fs_local_thread_pool_size == 100
+        assert config.storage.fs_local_disk_usage_concurrency == 32
+        assert config.storage.copy_chunk_size == 1024 * 1024
         assert config.platform.auth_url is None
         assert config.platform.admin_url is None
         assert config.platform.token == "test-token"
@@ -64,6 +82,8 @@ class TestConfig:
             "NP_STORAGE_MODE": "multiple",
             "NP_STORAGE_LOCAL_BASE_PATH": "/path/to/dir",
             "NP_STORAGE_LOCAL_THREAD_POOL_SIZE": "123",
+            "NP_STORAGE_LOCAL_DISK_USAGE_CONCURRENCY": "4",
+            "NP_STORAGE_COPY_CHUNK_SIZE": "262144",
             "NP_PLATFORM_AUTH_URL": "http://platform-auth",
             "NP_PLATFORM_ADMIN_URL": "http://platform-admin",
             "NP_PLATFORM_TOKEN": "test-token",
@@ -78,6 +98,8 @@ class TestConfig:
         assert config.storage.mode == StorageMode.MULTIPLE
         assert config.storage.fs_local_base_path == PurePath("/path/to/dir")
         assert config.storage.fs_local_thread_pool_size == 123
+        assert config.storage.fs_local_disk_usage_concurrency == 4
+        assert config.storage.copy_chunk_size == 262144
         assert config.platform.auth_url == URL("http://platform-auth")
         assert config.platform.admin_url == URL("http://platform-admin/apis/admin/v1")
         assert config.platform.token == "test-token"
@@ -1,10 +1,11 @@
+import asyncio
 import os
 import shutil
 import tempfile
 import uuid
 from collections.abc import AsyncIterator, Callable, Coroutine, Iterable, Iterator
 from pathlib import Path, PurePath
-from typing import Any
+from typing import Any, Optional
 from unittest import mock
 
 import pytest
@@ -134,8 +135,16 @@ class TestLocalFileSystem:
             payload = await f.read()
             assert payload == expected_payload
 
-    async def test_copy_streams(self, fs: FileSystem, tmp_dir_path: Path) -> None:
-        expected_payload = b"test"
+    @pytest.mark.parametrize(
+        ("size", "expected_payload"), [(None, b"test"), (3, b"tes"), (10, b"test")]
+    )
+    async def test_copy_streams(
+        self,
+        fs: FileSystem,
+        tmp_dir_path: Path,
+        size: Optional[int],
+        expected_payload: bytes,
+    ) -> None:
         chunk_size = 1
 
         out_filename = tmp_dir_path / str(uuid.uuid4())
@@ -147,12 +156,32 @@ class TestLocalFileSystem:
 
         async with fs.open(out_filename, mode="rb") as out_f:
             async with fs.open(in_filename, mode="wb") as in_f:
-                await copy_streams(out_f, in_f, chunk_size=chunk_size)
+                await copy_streams(out_f, in_f, size=size, chunk_size=chunk_size)
 
         async with fs.open(in_filename, mode="rb") as f:
             payload = await f.read()
             assert payload == expected_payload
 
+    async def test_copy_streams_cancelled(self) -> None:
+        written = []
+
+        class OutStream:
+            async def read(self, size: int) -> bytes:
+                return b"test"
+
+        class InStream:
+            async def write(self, data: bytes) -> None:
+                await asyncio.sleep(0.1)
+                written.append(data)
+
+        task = asyncio.ensure_future(copy_streams(OutStream(), InStream(), size=8))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert written == [b"test"]
+
     async def test_open_symlink(self, fs: FileSystem, symlink_to_file: Path) -> None:
         for mode in "rb", "rb+", "wb", "xb":
             with pytest.raises(FileNotFoundError):
@@ -1420,3 +1449,44 @@ class TestLocalFileSystem:
         ]
         assert result[0].size
         assert result[1].size
+
+    async def test_disk_usage_by_file_concurrent(self, tmp_dir_path: Path) -> None:
+        files = []
+        for i in range(5):
+            file = tmp_dir_path / f"test{i}"
+            file.write_text("test" * i)
+            files.append(file)
+
+        async with LocalFileSystem(disk_usage_concurrency=2) as fs:
+            result = await fs.disk_usage_by_file(*files)
+
+        assert result == [FileUsage(path=file, size=mock.ANY) for file in files]
+        assert not result[0].size
+        assert all(usage.size for usage in result[1:])
+
+    async def test_disk_usage_by_file_nested(self, tmp_dir_path: Path) -> None:
+        dir_path = tmp_dir_path / "dir"
+        (dir_path / "nested").mkdir(parents=True)
+        (dir_path / "nested" / "test").write_text("test" * 10000)
+        file = tmp_dir_path / "test"
+        file.write_text("test")
+
+        async with LocalFileSystem(disk_usage_concurrency=1) as fs:
+            result = await fs.disk_usage_by_file(
+                dir_path, dir_path / "nested", dir_path, file
+            )
+
+        assert result == [
+            FileUsage(path=dir_path, size=mock.ANY),
+            FileUsage(path=dir_path / "nested", size=mock.ANY),
+            FileUsage(path=dir_path, size=result[0].size),
+            FileUsage(path=file, size=mock.ANY),
+        ]
+        assert result[0].size >= result[1].size >= 40000
+
+    async def test_disk_usage_by_file_invalid_concurrency(self) -> None:
+        with pytest.raises(ValueError, match="disk_usage_concurrency"):
+            LocalFileSystem(disk_usage_concurrency=0)
+
+    async def test_disk_usage_by_file_no_paths(self, fs: FileSystem) -> None:
+        assert await fs.disk_usage_by_file() == []
@@ -0,0 +1,202 @@
+import asyncio
+import gc
+from enum import Enum
+from pathlib import PurePath
+from typing import Any, Optional, Union
+
+import pytest
+from aiohttp.test_utils import make_mocked_request
+from aiohttp.web import Application, HTTPNotFound, HTTPUnauthorized, Request
+from aiohttp_security import AbstractAuthorizationPolicy, setup as setup_security
+from neuro_auth_client.client import ClientAccessSubTreeView, ClientSubTreeViewRoot
+from neuro_auth_client.security import IdentityPolicy
+from yarl import URL
+
+from platform_storage_api.config import (
+    Config,
+    PlatformConfig,
+    S3Config,
+    StorageConfig,
+    StorageServerConfig,
+)
+from platform_storage_api.security import AUTH_CLIENT_KEY, PermissionChecker
+
+
+P = PurePath
+
+
+class MockAuthClient:
+    def __init__(self, call_log: list[Any], action: str) -> None:
+        self.call_log = call_log
+        self.action = action
+
+    async def get_permissions_tree(
+        self, name: str, resource: str
+    ) -> ClientSubTreeViewRoot:
+        self.call_log.append(("tree", name, resource))
+        await asyncio.sleep(0.1)
+        return ClientSubTreeViewRoot(
+            scheme="storage",
+            path=resource,
+            sub_tree=ClientAccessSubTreeView(action=self.action, children={}),
+        )
+
+
+class MockAuthPolicy(AbstractAuthorizationPolicy):
+    def __init__(self, call_log: list[Any], action: str) -> None:
+        self.call_log = call_log
+        self.action = action
+
+    async def authorized_userid(self, identity: str) -> Optional[str]:
+        self.call_log.append(("user", identity))
+        return "user" if identity == "token" else None
+
+    async def permits(
+        self,
+        identity: Optional[str],
+        permission: Union[str, Enum],
+        context: Any = None,
+    ) -> bool:
+        self.call_log.append(("permits", identity, permission))
+        await asyncio.sleep(0.1)
+        return permission == "read" or self.action == permission
+
+
+@pytest.fixture
+def call_log() -> list[Any]:
+    return []
+
+
+@pytest.fixture
+def config() -> Config:
+    return Config(
+        server=StorageServerConfig(),
+        storage=StorageConfig(fs_local_base_path=PurePath("/tmp/np_storage")),
+        platform=PlatformConfig(
+            auth_url=URL("http://platform-auth"),
+            admin_url=URL("http://platform-admin"),
+            token="test-token",
+            cluster_name="test-cluster",
+        ),
+        s3=S3Config(region="test-region", bucket_name="test-bucket"),
+    )
+
+
+@pytest.fixture
+def app(call_log: list[Any]) -> Application:
+    app = Application()
+    setup_security(app, IdentityPolicy(), MockAuthPolicy(call_log, "read"))
+    app[AUTH_CLIENT_KEY] = MockAuthClient(call_log, "read")  # type: ignore
+    return app
+
+
+@pytest.fixture
+def checker(app: Application, config: Config) -> PermissionChecker:
+    return PermissionChecker(app, config)
+
+
+def make_request(app: Application, token: str = "token") -> Request:
+    return make_mocked_request(
+        "GET", "/", headers={"Authorization": f"Bearer {token}"}, app=app
+    )
+
+
+class TestPermissionChecker:
+    async def test_get_user_permissions_tree_uri(
+        self, app: Application, checker: PermissionChecker, call_log: list[Any]
+    ) -> None:
+        await checker.get_user_permissions_tree(make_request(app), P("/user/a b#c"))
+
+        assert call_log[-1] == ("tree", "user", "storage://test-cluster/user/a%20b%23c")
+
+    async def test_get_user_permissions_tree_coalesced(
+        self, app: Application, checker: PermissionChecker, call_log: list[Any]
+    ) -> None:
+        trees = await asyncio.gather(
+            *(
+                checker.get_user_permissions_tree(make_request(app), P("/user"))
+                for _ in range(5)
+            )
+        )
+
+        assert trees == [ClientAccessSubTreeView(action="read", children={})] * 5
+        assert call_log == [
+            ("user", "token"),
+            ("tree", "user", "storage://test-cluster/user"),
+        ]
+
+        call_log.clear()
+        await checker.get_user_permissions_tree(make_request(app), P("/user"))
+        assert call_log == [
+            ("user", "token"),
+            ("tree", "user", "storage://test-cluster/user"),
+        ]
+
+    async def test_get_user_permissions_tree_waiters_cancelled(
+        self, app: Application, checker: PermissionChecker
+    ) -> None:
+        async def get_permissions_tree(name: str, resource: str) -> None:
+            await asyncio.sleep(0.1)
+            raise RuntimeError
+
+        app[AUTH_CLIENT_KEY].get_permissions_tree = get_permissions_tree  # type: ignore
+        loop = asyncio.get_running_loop()
+        errors: list[dict[str, Any]] = []
+        loop.set_exception_handler(lambda loop, context: errors.append(context))
+
+        task = asyncio.ensure_future(
+            checker.get_user_permissions_tree(make_request(app), P("/user"))
+        )
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.sleep(0.1)
+        del task
+        gc.collect()
+
+        assert errors == []
+
+    async def test_check_user_permissions_coalesced(
+        self, app: Application, checker: PermissionChecker, call_log: list[Any]
+    ) -> None:
+        await asyncio.gather(
+            *(
+                checker.check_user_permissions(make_request(app), P("/user"), "read")
+                for _ in range(5)
+            )
+        )
+
+        assert call_log == [("user", "token"), ("permits", "token", "read")]
+
+    async def test_check_user_permissions_bulk(
+        self, app: Application, checker: PermissionChecker, call_log: list[Any]
+    ) -> None:
+        await checker.check_user_permissions_bulk(
+            make_request(app), [P("/user/old"), P("/user/new")], "read"
+        )
+
+        assert call_log == [("user", "token"), ("permits", "token", "read")]
+
+    async def test_check_user_permissions_denied(
+        self, app: Application, checker: PermissionChecker
+    ) -> None:
+        results = await asyncio.gather(
+            *(
+                checker.check_user_permissions(make_request(app), P("/user"), "write")
+                for _ in range(2)
+            ),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, HTTPNotFound) for r in results)
+        assert results[0] is not results[1]
+
+    async def test_check_user_permissions_unauthorized(
+        self, app: Application, checker: PermissionChecker
+    ) -> None:
+        with pytest.raises(HTTPUnauthorized) as exc_info:
+            await checker.check_user_permissions(
+                make_request(app, token="invalid"), P("/user"), "read"
+            )
+        assert exc_info.value.headers["WWW-Authenticate"] == (
+            'Bearer realm="Storage API"'
+        )
@@ -1,16 +1,27 @@
 import os
 import shutil
+from dataclasses import replace
 from io import BytesIO
 from pathlib import Path, PurePath
 from typing import Any
+from unittest import mock
 
 import pytest
 
+from platform_storage_api.config import (
+    Config,
+    PlatformConfig,
+    S3Config,
+    StorageConfig,
+    StorageMode,
+    StorageServerConfig,
+)
 from platform_storage_api.fs.local import FileStatusType, FileSystem, LocalFileSystem
 from platform_storage_api.storage import (
     MultipleStoragePathResolver,
     SingleStoragePathResolver,
     Storage,
+    create_path_resolver,
 )
 
 
@@ -22,6 +33,22 @@ class AsyncBytesIO(BytesIO):
         return super().write(*args, **kwargs)
 
 
+class TestSingleStoragePathResolver:
+    async def test_resolve_path(self) -> None:
+        resolver = SingleStoragePathResolver("/base")
+
+        path = await resolver.resolve_path(PurePath("/"))
+        assert path == PurePath("/base")
+
+        path = await resolver.resolve_path(PurePath("/user/dir"))
+        assert path == PurePath("/base/user/dir")
+        assert await resolver.resolve_path(PurePath("/user/dir")) == path
+        assert await resolver.resolve_path("/user/dir") == path
+
+        with pytest.raises(ValueError, match="not in the subpath"):
+            await resolver.resolve_path(PurePath("user"))
+
+
 class TestMultipleStoragePathResolver:
     async def test_resolve_base_path(
         self, local_fs: FileSystem, local_tmp_dir_path: Path
@@ -43,6 +70,70 @@ class TestMultipleStoragePathResolver:
         path = await resolver.resolve_base_path(PurePath("/org/dir"))
         assert path == local_tmp_dir_path
 
+        path = await resolver.resolve_base_path("/org/dir")
+        assert path == local_tmp_dir_path
+
+    async def test_resolve_base_path_cached(
+        self, local_fs: FileSystem, local_tmp_dir_path: Path
+    ) -> None:
+        now = 0.0
+        resolver = MultipleStoragePathResolver(
+            local_fs,
+            local_tmp_dir_path,
+            local_tmp_dir_path / "default",
+            time_factory=lambda: now,
+            expiration_interval_s=30.0,
+        )
+
+        path = await resolver.resolve_base_path(PurePath("/org"))
+        assert path == local_tmp_dir_path / "default"
+
+        await local_fs.mkdir(local_tmp_dir_path / "org")
+        path = await resolver.resolve_base_path(PurePath("/org"))
+        assert path == local_tmp_dir_path
+
+        await local_fs.remove(local_tmp_dir_path / "org", recursive=True)
+        now = 29.0
+        path = await resolver.resolve_base_path(PurePath("/org/dir"))
+        assert path == local_tmp_dir_path
+
+        now = 30.0
+        path = await resolver.resolve_base_path(PurePath("/org/dir"))
+        assert path == local_tmp_dir_path / "default"
+
+
+class TestCreatePathResolver:
+    @pytest.fixture
+    def config(self) -> Config:
+        return Config(
+            server=StorageServerConfig(),
+            storage=StorageConfig(fs_local_base_path=PurePath("/base")),
+            platform=PlatformConfig(
+                auth_url=None,
+                admin_url=None,
+                token="test-token",
+                cluster_name="test-cluster",
+            ),
+            s3=S3Config(region="test-region", bucket_name="test-bucket"),
+        )
+
+    async def test_single(self, config: Config, local_fs: FileSystem) -> None:
+        resolver = create_path_resolver(config, local_fs)
+
+        assert isinstance(resolver, SingleStoragePathResolver)
+        assert await resolver.resolve_base_path() == PurePath("/base")
+
+    async def test_multiple(self, config: Config, local_fs: FileSystem) -> None:
+        config = replace(
+            config, storage=replace(config.storage, mode=StorageMode.MULTIPLE)
+        )
+
+        resolver = create_path_resolver(config, local_fs)
+
+        assert isinstance(resolver, MultipleStoragePathResolver)
+        path = await resolver.resolve_base_path(PurePath("/user"))
+        assert path == PurePath("/base/test-cluster")
+
 
 class TestStorage:
     @pytest.fixture
@@ -58,6 +149,10 @@ class TestStorage:
         assert PurePath("/path") == storage.sanitize_path("super/../path/")
         assert PurePath("/path") == storage.sanitize_path("/super/../path/")
         assert PurePath("/") == storage.sanitize_path("/super/../path/../..")
+        assert PurePath("/path") == storage.sanitize_path("//path")
+        assert PurePath("/path/to") == storage.sanitize_path("path/./to")
+        assert PurePath("/path/to") == storage.sanitize_path(PurePath("path/to"))
+        assert storage.sanitize_path("path/to") is storage.sanitize_path("path/to")
 
     async def test_store(
         self, storage: Storage, local_fs: FileSystem, local_tmp_dir_path: PurePath
@@ -78,6 +173,18 @@ class TestStorage:
             payload = await f.read()
             assert payload == expected_payload
 
+    async def test_store_existing_dir(
+        self, storage: Storage, local_fs: FileSystem, local_tmp_dir_path: PurePath
+    ) -> None:
+        await local_fs.mkdir(local_tmp_dir_path / "path")
+
+        with mock.patch.object(local_fs, "mkdir") as mkdir:
+            await storage.store(AsyncBytesIO(b"test"), "/path/file")
+
+        mkdir.assert_not_called()
+        async with local_fs.open(local_tmp_dir_path / "path/file", "rb") as f:
+            assert await f.read() == b"test"
+
     async def test_store_dont_create(
         self, storage: Storage, local_fs: FileSystem, local_tmp_dir_path: PurePath
     ) -> None:
@@ -153,6 +260,23 @@ class TestStorage:
         payload = await instream.read()
         assert payload == b"cont"
 
+    async def test_read(
+        self, storage: Storage, local_fs: FileSystem, local_tmp_dir_path: PurePath
+    ) -> None:
+        real_file_path = local_tmp_dir_path / "file"
+        async with local_fs.open(real_file_path, "wb") as f:
+            await f.write(b"test content")
+
+        assert await storage.read("/file", 5, 4) == b"cont"
+
+    async def test_read_dont_create(
+        self, storage: Storage, local_tmp_dir_path: Path
+    ) -> None:
+        with pytest.raises(FileNotFoundError):
+            await storage.read("/dir/file", 0, 4)
+
+        assert not (local_tmp_dir_path / "dir").exists()
+
     async def test_filestatus_file(
         self, storage: Storage, local_fs: LocalFileSystem, local_tmp_dir_path: PurePath
     ) -> None:
@@ -17,7 +17,11 @@ from platform_storage_api.config import (
 )
 from platform_storage_api.fs.local import FileSystem
 from platform_storage_api.storage import SingleStoragePathResolver
-from platform_storage_api.storage_usage import StorageUsage, StorageUsageService
+from platform_storage_api.storage_usage import (
+    StorageUsage,
+    StorageUsageCollector,
+    StorageUsageService,
+)
 
 
 @pytest.fixture
@@ -141,3 +145,33 @@ class TestStorageUsage:
         storage_usage = await storage_usage_service.get_storage_usage()
 
         assert storage_usage == StorageUsage(projects=[])
+
+
+class TestStorageUsageCollector:
+    def test_collect(self, config: Config) -> None:
+        storage_metrics_s3_storage = mock.Mock()
+        storage_metrics_s3_storage.get_storage_usage.return_value = StorageUsage(
+            projects=[
+                StorageUsage.Project(project_name="test-project-1", used=1),
+                StorageUsage.Project(
+                    org_name="test-org", project_name="test-project-2", used=2
+                ),
+            ]
+        )
+        collector = StorageUsageCollector(config.s3, storage_metrics_s3_storage)
+
+        (metric,) = collector.collect()
+
+        assert metric.name == "storage_used_bytes"
+        assert [(s.name, s.labels, s.value) for s in metric.samples] == [
+            (
+                "storage_used_bytes",
+                {"org_name": "no_org", "project_name": "test-project-1"},
+                1,
+            ),
+            (
+                "storage_used_bytes",
+                {"org_name": "test-org", "project_name": "test-project-2"},
+                2,
+            ),
+        ]